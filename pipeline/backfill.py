@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from pipeline.lib.paths import BRONZE_DIR, GOLD_DIR, SILVER_DIR
+from pipeline.lib.resources import worker_budget
+from pipeline.lib.snapshots import list_snapshots, snapshot_dir
+from pipeline.metrics.imdb_metrics import run as run_metrics
+from pipeline.transform.imdb_transform import run as run_transform
+
+
+def select_snapshots(base_dir: Path, start: Optional[date], end: Optional[date]) -> List[date]:
+    return [
+        snapshot_date
+        for snapshot_date, _ in list_snapshots(base_dir)
+        if (start is None or snapshot_date >= start) and (end is None or snapshot_date <= end)
+    ]
+
+
+def _init_worker() -> None:
+    # Spawned workers (macOS/Windows) do not inherit the parent's logging setup.
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(process)d %(message)s")
+
+
+def _transform_worker(snapshot_date: date, threads: int, memory_limit: Optional[str]) -> date:
+    # Pruning is left to the regular weekly run; backfill only rewrites retained snapshots.
+    run_transform(snapshot_date, keep=None, threads=threads, memory_limit=memory_limit)
+    return snapshot_date
+
+
+def _metrics_worker(snapshot_date: date, threads: int, memory_limit: Optional[str]) -> date:
+    run_metrics(
+        snapshot_date,
+        output_dir=snapshot_dir(GOLD_DIR, snapshot_date),
+        threads=threads,
+        memory_limit=memory_limit,
+    )
+    return snapshot_date
+
+
+def _run_stage(
+    name: str,
+    worker: Callable[[date, int, Optional[str]], date],
+    snapshot_dates: List[date],
+    workers: int,
+) -> None:
+    threads, memory_limit = worker_budget(workers)
+    logging.info(
+        "Backfill %s: %s snapshot(s), %s worker(s) x %s thread(s), memory_limit=%s",
+        name,
+        len(snapshot_dates),
+        workers,
+        threads,
+        memory_limit or "default",
+    )
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(worker, snapshot_date, threads, memory_limit) for snapshot_date in snapshot_dates]
+        for future in futures:
+            logging.info("Backfill %s done for %s", name, future.result().isoformat())
+
+
+def run(
+    start: Optional[date],
+    end: Optional[date],
+    workers: Optional[int] = None,
+    metrics_only: bool = False,
+) -> List[date]:
+    source_dir = SILVER_DIR if metrics_only else BRONZE_DIR
+    snapshot_dates = select_snapshots(source_dir, start, end)
+    if not snapshot_dates:
+        raise FileNotFoundError(f"No complete snapshots in {source_dir} for the requested range.")
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(snapshot_dates)))
+
+    # Metrics for a snapshot read the previous silver snapshot too, so every transform finishes first.
+    if not metrics_only:
+        _run_stage("transform", _transform_worker, snapshot_dates, workers)
+    _run_stage("metrics", _metrics_worker, snapshot_dates, workers)
+
+    logging.info("Backfilled gold for %s snapshot(s) into %s", len(snapshot_dates), GOLD_DIR)
+    return snapshot_dates
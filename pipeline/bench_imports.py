@@ -0,0 +1,80 @@
+"""Import-time benchmark for pipeline entry points: `python -m pipeline.bench_imports`.
+
+Each module is imported in a fresh interpreter. The run fails if any entry point pulls in a heavy
+dependency at import time, or if --max-ms is given and an import is slower than that.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ENTRY_POINTS = (
+    "pipeline.cli",
+    "pipeline.run_pipeline",
+    "pipeline.backfill",
+    "pipeline.ingest.imdb_ingest",
+    "pipeline.transform.imdb_transform",
+    "pipeline.metrics.imdb_metrics",
+    "pipeline.lib.io",
+)
+HEAVY_MODULES = ("duckdb", "pandas", "pyarrow", "requests", "numpy")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"ms": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(module: str, runs: int) -> Dict[str, object]:
+    repo_root = Path(__file__).resolve().parents[1]
+    timings: List[float] = []
+    heavy: List[str] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(sample["ms"])
+        heavy = sample["heavy"]
+    return {"module": module, "medianMs": round(statistics.median(timings), 1), "heavy": heavy}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline entry point import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (default: 5)")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if a median import exceeds this")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    failures: List[str] = []
+    for module in ENTRY_POINTS:
+        result = measure(module, args.runs)
+        print(f"{result['module']:<36} {result['medianMs']:>8.1f} ms  heavy={','.join(result['heavy']) or '-'}")
+        if result["heavy"]:
+            failures.append(f"{module} imports {', '.join(result['heavy'])} at import time")
+        if args.max_ms is not None and result["medianMs"] > args.max_ms:
+            failures.append(f"{module} took {result['medianMs']} ms (limit {args.max_ms} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Lightweight pipeline commands for schedulers: `python -m pipeline status|list-snapshots`.
+
+Only reads manifests and directory names, so it never imports duckdb, pandas, pyarrow or requests.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from pipeline.lib.io import read_json
+from pipeline.lib.paths import APPROX_DIR, BRONZE_DIR, DASHBOARD_DATA_DIR, GOLD_DIR, SILVER_DIR
+from pipeline.lib.snapshots import is_complete, list_snapshots
+
+LAYERS = {
+    "bronze": BRONZE_DIR,
+    "silver": SILVER_DIR,
+    "gold": GOLD_DIR,
+    "approx": APPROX_DIR,
+}
+
+
+def snapshot_entries(base_dir: Path) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    for snapshot_date, path in list_snapshots(base_dir, include_incomplete=True):
+        manifest = read_json(path / "manifest.json") or {}
+        entries.append(
+            {
+                "snapshotDate": snapshot_date.isoformat(),
+                "complete": is_complete(path),
+                "generatedAt": manifest.get("generatedAt"),
+                "path": str(path),
+            }
+        )
+    return entries
+
+
+def staging_leftovers(base_dir: Path) -> List[str]:
+    if not base_dir.exists():
+        return []
+    return sorted(str(item) for item in base_dir.iterdir() if item.name.endswith((".staging", ".old")))
+
+
+def collect_status() -> Dict[str, Any]:
+    layers: Dict[str, Any] = {}
+    for name, base_dir in LAYERS.items():
+        entries = snapshot_entries(base_dir)
+        complete = [entry for entry in entries if entry["complete"]]
+        layers[name] = {
+            "latest": complete[-1]["snapshotDate"] if complete else None,
+            "complete": len(complete),
+            "incomplete": [entry["snapshotDate"] for entry in entries if not entry["complete"]],
+            "staging": staging_leftovers(base_dir),
+        }
+
+    dashboard = read_json(DASHBOARD_DATA_DIR / "manifest.json") or {}
+    layers["dashboard"] = {
+        "snapshotDate": dashboard.get("snapshotDate"),
+        "generatedAt": dashboard.get("generatedAt"),
+        "datasets": len(dashboard.get("datasets", [])),
+        "staging": staging_leftovers(DASHBOARD_DATA_DIR.parent),
+    }
+    return layers
+
+
+def print_status(status: Dict[str, Any]) -> None:
+    for name in LAYERS:
+        layer = status[name]
+        line = f"{name:<9} latest={layer['latest'] or '-'} complete={layer['complete']}"
+        if layer["incomplete"]:
+            line += f" incomplete={','.join(layer['incomplete'])}"
+        if layer["staging"]:
+            line += f" staging={len(layer['staging'])}"
+        print(line)
+    dashboard = status["dashboard"]
+    print(
+        f"{'dashboard':<9} snapshot={dashboard['snapshotDate'] or '-'} "
+        f"generatedAt={dashboard['generatedAt'] or '-'} datasets={dashboard['datasets']}"
+    )
+
+
+def print_snapshots(layers: Dict[str, List[Dict[str, Any]]]) -> None:
+    for name, entries in layers.items():
+        for entry in entries:
+            state = "complete" if entry["complete"] else "incomplete"
+            print(f"{name:<7} {entry['snapshotDate']} {state:<10} {entry['generatedAt'] or '-'}")
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m pipeline", description="Inspect IMDb pipeline state")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    status = subparsers.add_parser("status", help="Latest complete snapshot per layer and published gold")
+    status.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+
+    snapshots = subparsers.add_parser("list-snapshots", help="List snapshots per layer with completion state")
+    snapshots.add_argument("--layer", choices=sorted(LAYERS), default=None, help="Only list one layer")
+    snapshots.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    if args.command == "status":
+        status = collect_status()
+        if args.json:
+            json.dump(status, sys.stdout, indent=2)
+            print()
+        else:
+            print_status(status)
+        return
+
+    names = [args.layer] if args.layer else list(LAYERS)
+    layers = {name: snapshot_entries(LAYERS[name]) for name in names}
+    if args.json:
+        json.dump(layers, sys.stdout, indent=2)
+        print()
+    else:
+        print_snapshots(layers)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,20 @@
+from __future__ import annotations
+
 import argparse
+import asyncio
 import hashlib
 import logging
 from datetime import date
 from pathlib import Path
 from typing import Dict, List
 
-import requests
-
-from pipeline.lib.io import ensure_dir, now_utc_iso, write_json
+from pipeline.ingest.streaming import stream_datasets
+from pipeline.lib.io import ensure_dir, now_utc_iso, staged_output, write_json
+from pipeline.lib.lazy import lazy_import
 from pipeline.lib.snapshots import prune_snapshots, snapshot_dir
 
+requests = lazy_import("requests")
+
 DATASETS = {
     "title.basics.tsv.gz": "https://datasets.imdbws.com/title.basics.tsv.gz",
     "title.ratings.tsv.gz": "https://datasets.imdbws.com/title.ratings.tsv.gz",
@@ -35,26 +40,29 @@ def download_file(url: str, dest: Path) -> Dict[str, str | int]:
     }
 
 
-def run(snapshot_date: date, keep: int) -> None:
+def run(snapshot_date: date, keep: int, stream: bool = False) -> None:
     pipeline_dir = Path(__file__).resolve().parents[1]
     bronze_dir = pipeline_dir / "data" / "bronze"
     ensure_dir(bronze_dir)
 
     snapshot_path = snapshot_dir(bronze_dir, snapshot_date)
-    ensure_dir(snapshot_path)
-
-    datasets_meta: List[Dict[str, str | int]] = []
-    for filename, url in DATASETS.items():
-        dest = snapshot_path / filename
-        meta = download_file(url, dest)
-        datasets_meta.append(meta)
-
-    manifest = {
-        "snapshotDate": snapshot_date.isoformat(),
-        "generatedAt": now_utc_iso(),
-        "datasets": datasets_meta,
-    }
-    write_json(snapshot_path / "manifest.json", manifest)
+
+    with staged_output(snapshot_path) as staging_path:
+        datasets_meta: List[Dict[str, str | int]] = []
+        if stream:
+            datasets_meta = asyncio.run(stream_datasets(DATASETS, staging_path))
+        else:
+            for filename, url in DATASETS.items():
+                dest = staging_path / filename
+                meta = download_file(url, dest)
+                datasets_meta.append(meta)
+
+        manifest = {
+            "snapshotDate": snapshot_date.isoformat(),
+            "generatedAt": now_utc_iso(),
+            "datasets": datasets_meta,
+        }
+        write_json(staging_path / "manifest.json", manifest)
 
     removed = prune_snapshots(bronze_dir, keep=keep)
     if removed:
@@ -77,13 +85,18 @@ def parse_args() -> argparse.Namespace:
         default=8,
         help="Number of snapshots to retain (default: 8)",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse downloads into Parquet while streaming (transform then skips TSV parsing)",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     args = parse_args()
-    run(args.snapshot_date, args.keep)
+    run(args.snapshot_date, args.keep, args.stream)
 
 
 if __name__ == "__main__":
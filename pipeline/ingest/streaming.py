@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import logging
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pipeline.lib.lazy import lazy_import
+from pipeline.lib.snapshots import parquet_name
+
+pa = lazy_import("pyarrow")
+pa_csv = lazy_import("pyarrow.csv")
+pq = lazy_import("pyarrow.parquet")
+requests = lazy_import("requests")
+
+CHUNK_SIZE = 1024 * 1024
+QUEUE_CHUNKS = 8
+BATCH_ROWS = 100_000
+NULL_VALUE = "\\N"
+
+
+class TsvParquetWriter:
+    """Incrementally gunzips IMDb TSV bytes and writes all-varchar Parquet row batches."""
+
+    def __init__(self, dest: Path, batch_rows: int = BATCH_ROWS) -> None:
+        self.dest = dest
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._pending = b""
+        self._columns: Optional[List[str]] = None
+        self._block: List[bytes] = []
+        self._block_rows = 0
+        self._writer: Optional[pq.ParquetWriter] = None
+
+    def feed(self, chunk: bytes) -> None:
+        data = self._pending + self._decompressor.decompress(chunk)
+        complete, newline, self._pending = data.rpartition(b"\n")
+        if newline:
+            self._add_lines(complete + newline)
+
+    def close(self) -> int:
+        tail = self._pending + self._decompressor.flush()
+        self._pending = b""
+        if tail:
+            self._add_lines(tail if tail.endswith(b"\n") else tail + b"\n")
+        if self._block or self._writer is None:
+            self._flush()
+        if self._writer is not None:
+            self._writer.close()
+        return self.rows
+
+    def _add_lines(self, data: bytes) -> None:
+        if self._columns is None:
+            header, _, data = data.partition(b"\n")
+            self._columns = header.decode("utf-8").rstrip("\r").split("\t")
+        self._block.append(data)
+        self._block_rows += data.count(b"\n")
+        if self._block_rows >= self.batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._columns is None:
+            raise ValueError(f"No header found for {self.dest.name}")
+        schema = pa.schema([(name, pa.string()) for name in self._columns])
+        data = b"".join(self._block)
+        if not data:
+            table = schema.empty_table()
+        else:
+            table = pa_csv.read_csv(
+                io.BytesIO(data),
+                read_options=pa_csv.ReadOptions(column_names=self._columns),
+                # IMDb TSVs are unquoted; quote characters are literal title text.
+                parse_options=pa_csv.ParseOptions(delimiter="\t", quote_char=False),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types=schema,
+                    null_values=[NULL_VALUE],
+                    strings_can_be_null=True,
+                ),
+            )
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.dest, schema)
+        self._writer.write_table(table)
+        self.rows += table.num_rows
+        self._block = []
+        self._block_rows = 0
+
+
+async def _download(url: str, dest: Path, queue: asyncio.Queue) -> Dict[str, str | int]:
+    sha256 = hashlib.sha256()
+    response = await asyncio.to_thread(requests.get, url, stream=True, timeout=120)
+    try:
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+        with dest.open("wb") as handle:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                if not chunk:
+                    continue
+                await asyncio.to_thread(handle.write, chunk)
+                sha256.update(chunk)
+                # Blocks while the parser is QUEUE_CHUNKS behind, throttling the download.
+                await queue.put(chunk)
+    finally:
+        response.close()
+    await queue.put(None)
+    return {
+        "url": url,
+        "path": str(dest.name),
+        "sizeBytes": dest.stat().st_size,
+        "sha256": sha256.hexdigest(),
+    }
+
+
+async def _parse(queue: asyncio.Queue, writer: TsvParquetWriter) -> int:
+    while True:
+        chunk = await queue.get()
+        if chunk is None:
+            break
+        await asyncio.to_thread(writer.feed, chunk)
+    return await asyncio.to_thread(writer.close)
+
+
+async def stream_dataset(
+    url: str,
+    dest: Path,
+    parquet_dest: Path,
+    batch_rows: int = BATCH_ROWS,
+    queue_chunks: int = QUEUE_CHUNKS,
+) -> Dict[str, str | int]:
+    logging.info("Streaming %s", url)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_chunks)
+    download = asyncio.create_task(_download(url, dest, queue))
+    parse = asyncio.create_task(_parse(queue, TsvParquetWriter(parquet_dest, batch_rows)))
+    try:
+        meta, rows = await asyncio.gather(download, parse)
+    except BaseException:
+        download.cancel()
+        parse.cancel()
+        raise
+    meta["parsedPath"] = str(parquet_dest.name)
+    meta["parsedRows"] = rows
+    return meta
+
+
+async def stream_datasets(
+    datasets: Dict[str, str],
+    snapshot_path: Path,
+    batch_rows: int = BATCH_ROWS,
+    queue_chunks: int = QUEUE_CHUNKS,
+) -> List[Dict[str, str | int]]:
+    return list(
+        await asyncio.gather(
+            *(
+                stream_dataset(
+                    url,
+                    snapshot_path / filename,
+                    snapshot_path / parquet_name(filename),
+                    batch_rows=batch_rows,
+                    queue_chunks=queue_chunks,
+                )
+                for filename, url in datasets.items()
+            )
+        )
+    )
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 import json
-from typing import Any, Dict, Optional
+import os
+import shutil
+from typing import Any, Dict, Iterator, Optional
 
-import pandas as pd
+from pipeline.lib.lazy import lazy_import
+
+pd = lazy_import("pandas")
 
 
 def ensure_dir(path: Path) -> None:
@@ -16,10 +21,78 @@ def now_utc_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
+def read_json(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
 def write_json(path: Path, payload: Dict[str, Any]) -> None:
     ensure_dir(path.parent)
-    with path.open("w", encoding="utf-8") as handle:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
         json.dump(payload, handle, indent=2, ensure_ascii=True)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def fsync_dir(path: Path) -> None:
+    # Directory handles can only be fsynced on POSIX.
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_tree(path: Path) -> None:
+    for item in sorted(path.rglob("*"), reverse=True):
+        if item.is_file():
+            with item.open("rb") as handle:
+                os.fsync(handle.fileno())
+        elif item.is_dir():
+            fsync_dir(item)
+    fsync_dir(path)
+
+
+@contextmanager
+def staged_output(final_dir: Path, merge: bool = False) -> Iterator[Path]:
+    """Yield a staging directory that is fsynced and published to final_dir on success.
+
+    By default final_dir is replaced as a whole via rename. With merge=True each staged file is
+    moved into final_dir with os.replace, leaving files that were not staged untouched.
+    """
+    staging_dir = final_dir.with_name(f".{final_dir.name}.staging")
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    ensure_dir(staging_dir)
+    try:
+        yield staging_dir
+        fsync_tree(staging_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    if merge:
+        ensure_dir(final_dir)
+        for item in sorted(staging_dir.iterdir(), key=lambda p: p.name == "manifest.json"):
+            os.replace(item, final_dir / item.name)
+        fsync_dir(final_dir)
+        staging_dir.rmdir()
+        return
+
+    old_dir = final_dir.with_name(f".{final_dir.name}.old")
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    if final_dir.exists():
+        final_dir.rename(old_dir)
+    staging_dir.rename(final_dir)
+    fsync_dir(final_dir.parent)
+    shutil.rmtree(old_dir, ignore_errors=True)
 
 
 def write_dataset(
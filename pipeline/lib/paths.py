@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+PIPELINE_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = PIPELINE_DIR / "data"
+BRONZE_DIR = DATA_DIR / "bronze"
+SILVER_DIR = DATA_DIR / "silver"
+GOLD_DIR = DATA_DIR / "gold"
+APPROX_DIR = DATA_DIR / "approx"
+DASHBOARD_DATA_DIR = PIPELINE_DIR.parent / "dashboard" / "public" / "data"
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+# Share of physical memory handed to DuckDB across all workers; the rest is left to Python and the OS.
+MEMORY_SHARE = 0.75
+
+
+def total_memory_bytes() -> Optional[int]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def worker_budget(workers: int) -> Tuple[int, Optional[str]]:
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    total = total_memory_bytes()
+    if total is None:
+        return threads, None
+    memory_mb = max(256, int(total * MEMORY_SHARE / workers) // (1024 * 1024))
+    return threads, f"{memory_mb}MB"
+
+
+def duckdb_config(threads: Optional[int] = None, memory_limit: Optional[str] = None) -> Dict[str, Any]:
+    config: Dict[str, Any] = {}
+    if threads:
+        config["threads"] = threads
+    if memory_limit:
+        config["memory_limit"] = memory_limit
+    return config
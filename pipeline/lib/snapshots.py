@@ -16,14 +16,19 @@ def parse_snapshot_dir(path: Path) -> Optional[date]:
     return date.fromisoformat(match.group(1))
 
 
-def list_snapshots(base_dir: Path) -> List[Tuple[date, Path]]:
+def is_complete(path: Path) -> bool:
+    # Every stage writes its manifest last, so a snapshot without one was interrupted.
+    return (path / "manifest.json").is_file()
+
+
+def list_snapshots(base_dir: Path, include_incomplete: bool = False) -> List[Tuple[date, Path]]:
     if not base_dir.exists():
         return []
     snapshots: List[Tuple[date, Path]] = []
     for item in base_dir.iterdir():
         if item.is_dir():
             snapshot_date = parse_snapshot_dir(item)
-            if snapshot_date:
+            if snapshot_date and (include_incomplete or is_complete(item)):
                 snapshots.append((snapshot_date, item))
     snapshots.sort(key=lambda x: x[0])
     return snapshots
@@ -39,6 +44,11 @@ def previous_snapshot(base_dir: Path, current_date: date) -> Optional[Tuple[date
     return snapshots[-1] if snapshots else None
 
 
+def parquet_name(filename: str) -> str:
+    # Name of the all-varchar Parquet that streaming ingest writes next to a bronze .tsv.gz.
+    return filename.removesuffix(".tsv.gz") + ".parquet"
+
+
 def snapshot_dir(base_dir: Path, snapshot_date: date) -> Path:
     return base_dir / f"snapshot_date={snapshot_date.isoformat()}"
 
@@ -1,13 +1,17 @@
+from __future__ import annotations
+
 import argparse
 import logging
 from datetime import date
 from pathlib import Path
 
-import duckdb
-import pandas as pd
+from pipeline.lib.io import now_utc_iso, staged_output, write_dataset, write_json
+from pipeline.lib.lazy import lazy_import
+from pipeline.lib.resources import duckdb_config
+from pipeline.lib.snapshots import is_complete, latest_snapshot, previous_snapshot, snapshot_dir
 
-from pipeline.lib.io import ensure_dir, now_utc_iso, write_dataset
-from pipeline.lib.snapshots import latest_snapshot, previous_snapshot, snapshot_dir
+duckdb = lazy_import("duckdb")
+pd = lazy_import("pandas")
 
 ALLOWED_TYPES = ("movie", "tvSeries", "tvMiniSeries")
 
@@ -19,13 +23,23 @@ CULT_MIN_RATING = 8.0
 CULT_MIN_VOTES = 5000
 CULT_MAX_VOTES = 20000
 TOP_LIMIT = 200
+GENRE_MIN_TITLES = 200
+
+# Approximate mode: error columns are ~95% half-widths (z = 1.96).
+APPROX_Z = 1.96
+# DuckDB's HyperLogLog keeps 64 registers, so the relative standard error is 1.04 / sqrt(64).
+HLL_RELATIVE_ERROR = 1.04 / 64 ** 0.5
+# Rank error allowance for approx_quantile's t-digest around the median.
+TDIGEST_RANK_ERROR = 0.01
+APPROX_MEDIAN_QUANTILES = (0.25, 0.5 - TDIGEST_RANK_ERROR, 0.5, 0.5 + TDIGEST_RANK_ERROR, 0.75)
+APPROX_SAMPLE_SEED = 42
 
 
 def resolve_snapshot(silver_dir: Path, snapshot_date: date | None) -> tuple[date, Path]:
     if snapshot_date:
         path = snapshot_dir(silver_dir, snapshot_date)
-        if not path.exists():
-            raise FileNotFoundError(f"Silver snapshot not found: {path}")
+        if not is_complete(path):
+            raise FileNotFoundError(f"Complete silver snapshot not found: {path}")
         return snapshot_date, path
 
     latest = latest_snapshot(silver_dir)
@@ -129,8 +143,9 @@ def run_queries(con: duckdb.DuckDBPyConnection, output_dir: Path, snapshot_date:
         "       ROUND(SUM(averageRating * numVotes) / NULLIF(SUM(numVotes), 0), 3) AS weightedRating "
         "FROM genre_exploded "
         "GROUP BY genre "
-        "HAVING COUNT(DISTINCT tconst) >= 200 "
-        "ORDER BY weightedRating DESC"
+        "HAVING COUNT(DISTINCT tconst) >= ? "
+        "ORDER BY weightedRating DESC",
+        [GENRE_MIN_TITLES],
     ).df()
     write_dataset(genre_weighted, output_dir, "genre_weighted_ratings", snapshot_date, generated_at)
 
@@ -291,23 +306,240 @@ def compute_rising_titles(
     write_dataset(rising, output_dir, "rising_titles_votes_week_over_week", current_snapshot.isoformat(), generated_at)
 
 
-def run(snapshot_date: date | None) -> None:
+def sample_titles(con: duckdb.DuckDBPyConnection, sample_rows: int | None) -> float:
+    total = con.execute("SELECT COUNT(*) FROM titles").fetchone()[0]
+    if not sample_rows or sample_rows >= total:
+        con.execute("CREATE OR REPLACE TEMP VIEW approx_titles AS SELECT * FROM titles")
+        return 1.0
+
+    con.execute(
+        "CREATE OR REPLACE TEMP TABLE approx_titles AS "
+        "SELECT * FROM titles "
+        f"USING SAMPLE reservoir({int(sample_rows)} ROWS) REPEATABLE ({APPROX_SAMPLE_SEED})"
+    )
+    logging.info("Sampled %s of %s titles", sample_rows, total)
+    return sample_rows / total
+
+
+def count_error(estimate: pd.Series, sampled: pd.Series, fraction: float) -> pd.Series:
+    sketch_var = (HLL_RELATIVE_ERROR * estimate) ** 2
+    sample_var = sampled * (1 - fraction) / fraction**2
+    return APPROX_Z * (sketch_var + sample_var) ** 0.5
+
+
+def sum_error(sampled_sq: pd.Series, fraction: float) -> pd.Series:
+    return APPROX_Z * (sampled_sq * (1 - fraction) / fraction**2) ** 0.5
+
+
+def mean_error(std: pd.Series, n: pd.Series, fraction: float) -> pd.Series:
+    return APPROX_Z * std.fillna(0) / n**0.5 * (1 - fraction) ** 0.5
+
+
+def median_with_error(quantiles: pd.Series, n: pd.Series, fraction: float) -> tuple[pd.Series, pd.Series]:
+    q1, low, median, high, q3 = (quantiles.str[i].astype(float) for i in range(len(APPROX_MEDIAN_QUANTILES)))
+    sketch_error = (high - low) / 2
+    # Asymptotic standard error of a sample median, with sigma estimated from the IQR.
+    sample_error = APPROX_Z * 1.2533 * ((q3 - q1) / 1.349) / n**0.5 * (1 - fraction) ** 0.5
+    return median, sketch_error + sample_error
+
+
+def run_approx_queries(
+    con: duckdb.DuckDBPyConnection,
+    output_dir: Path,
+    snapshot_date: str,
+    generated_at: str,
+    sample_rows: int | None,
+) -> None:
+    fraction = sample_titles(con, sample_rows)
+    note = (
+        "Approximate: HyperLogLog distinct counts and t-digest medians"
+        + (f" over a reservoir sample of {sample_rows} titles" if fraction < 1 else "")
+        + ". *Error columns are ~95% half-widths."
+    )
+
+    con.execute(
+        "CREATE OR REPLACE TEMP VIEW approx_genre_exploded AS "
+        "SELECT tconst, averageRating, numVotes, runtimeMinutes, startYear, "
+        "       unnest(str_split(genres, ',')) AS genre "
+        "FROM approx_titles "
+        "WHERE genres IS NOT NULL"
+    )
+
+    genre_weighted = con.execute(
+        "SELECT genre, "
+        "       approx_count_distinct(tconst) AS sampledTitles, "
+        "       SUM(numVotes) AS sampledVotes, "
+        "       SUM(CAST(numVotes AS DOUBLE) * numVotes) AS sampledVotesSq, "
+        "       SUM(averageRating * numVotes) / NULLIF(SUM(numVotes), 0) AS weightedRating, "
+        "       SUM(averageRating * averageRating * numVotes) / NULLIF(SUM(numVotes), 0) AS weightedRatingSq "
+        "FROM approx_genre_exploded "
+        "GROUP BY genre"
+    ).df()
+    genre_weighted["titleCount"] = (genre_weighted["sampledTitles"] / fraction).round().astype("int64")
+    genre_weighted["titleCountError"] = count_error(
+        genre_weighted["titleCount"], genre_weighted["sampledTitles"], fraction
+    ).round().astype("int64")
+    genre_weighted["totalVotes"] = (genre_weighted["sampledVotes"] / fraction).round().astype("int64")
+    genre_weighted["totalVotesError"] = sum_error(genre_weighted["sampledVotesSq"], fraction).round().astype("int64")
+    # Standard error of a weighted mean via the effective sample size (sum w)^2 / sum w^2.
+    weighted_var = (genre_weighted["weightedRatingSq"] - genre_weighted["weightedRating"] ** 2).clip(lower=0)
+    genre_weighted["weightedRatingError"] = (
+        APPROX_Z
+        * (weighted_var * genre_weighted["sampledVotesSq"]) ** 0.5
+        / genre_weighted["sampledVotes"]
+        * (1 - fraction) ** 0.5
+    ).round(3)
+    genre_weighted["weightedRating"] = genre_weighted["weightedRating"].round(3)
+    genre_weighted = genre_weighted[genre_weighted["titleCount"] >= GENRE_MIN_TITLES].sort_values(
+        "weightedRating", ascending=False
+    )
+    genre_weighted = genre_weighted[
+        [
+            "genre",
+            "titleCount",
+            "titleCountError",
+            "totalVotes",
+            "totalVotesError",
+            "weightedRating",
+            "weightedRatingError",
+        ]
+    ]
+    write_dataset(genre_weighted, output_dir, "genre_weighted_ratings", snapshot_date, generated_at, note=note)
+
+    con.execute(
+        "CREATE OR REPLACE TEMP VIEW approx_genre_totals AS "
+        "SELECT genre, SUM(numVotes) AS totalVotes "
+        "FROM approx_genre_exploded "
+        "GROUP BY genre "
+        "ORDER BY totalVotes DESC "
+        "LIMIT 12"
+    )
+
+    genre_popularity = con.execute(
+        "SELECT CAST(FLOOR(startYear / 10) * 10 AS INTEGER) AS decade, "
+        "       genre, "
+        "       approx_count_distinct(tconst) AS sampledTitles, "
+        "       SUM(numVotes) AS sampledVotes, "
+        "       SUM(CAST(numVotes AS DOUBLE) * numVotes) AS sampledVotesSq "
+        "FROM approx_genre_exploded "
+        "WHERE startYear IS NOT NULL "
+        "  AND genre IN (SELECT genre FROM approx_genre_totals) "
+        "GROUP BY decade, genre"
+    ).df()
+    genre_popularity["titleCount"] = (genre_popularity["sampledTitles"] / fraction).round().astype("int64")
+    genre_popularity["titleCountError"] = count_error(
+        genre_popularity["titleCount"], genre_popularity["sampledTitles"], fraction
+    ).round().astype("int64")
+    genre_popularity["totalVotes"] = (genre_popularity["sampledVotes"] / fraction).round().astype("int64")
+    genre_popularity["totalVotesError"] = sum_error(
+        genre_popularity["sampledVotesSq"], fraction
+    ).round().astype("int64")
+    genre_popularity = genre_popularity.sort_values(["decade", "totalVotes"], ascending=[True, False])
+    genre_popularity = genre_popularity[
+        ["decade", "genre", "titleCount", "titleCountError", "totalVotes", "totalVotesError"]
+    ]
+    write_dataset(genre_popularity, output_dir, "genre_popularity_by_decade", snapshot_date, generated_at, note=note)
+
+    quantiles_sql = "[" + ", ".join(str(value) for value in APPROX_MEDIAN_QUANTILES) + "]"
+    runtime_vs_rating = con.execute(
+        "SELECT genre, "
+        "       approx_count_distinct(tconst) AS sampledTitles, "
+        "       COUNT(*) AS sampledRows, "
+        "       AVG(runtimeMinutes) AS avgRuntimeMinutes, "
+        "       stddev_samp(runtimeMinutes) AS runtimeStd, "
+        f"       approx_quantile(runtimeMinutes, {quantiles_sql}) AS runtimeQuantiles, "
+        "       AVG(averageRating) AS avgRating, "
+        "       stddev_samp(averageRating) AS ratingStd, "
+        f"       approx_quantile(averageRating, {quantiles_sql}) AS ratingQuantiles "
+        "FROM approx_genre_exploded "
+        "WHERE runtimeMinutes IS NOT NULL "
+        "  AND runtimeMinutes > 0 "
+        "  AND genre IN (SELECT genre FROM approx_genre_totals) "
+        "GROUP BY genre"
+    ).df()
+    rows = runtime_vs_rating["sampledRows"]
+    runtime_vs_rating["titleCount"] = (runtime_vs_rating["sampledTitles"] / fraction).round().astype("int64")
+    runtime_vs_rating["titleCountError"] = count_error(
+        runtime_vs_rating["titleCount"], runtime_vs_rating["sampledTitles"], fraction
+    ).round().astype("int64")
+    runtime_vs_rating["avgRuntimeMinutesError"] = mean_error(runtime_vs_rating["runtimeStd"], rows, fraction).round(1)
+    runtime_vs_rating["avgRuntimeMinutes"] = runtime_vs_rating["avgRuntimeMinutes"].round(1)
+    median_runtime, median_runtime_error = median_with_error(runtime_vs_rating["runtimeQuantiles"], rows, fraction)
+    runtime_vs_rating["medianRuntimeMinutes"] = median_runtime.round(1)
+    runtime_vs_rating["medianRuntimeMinutesError"] = median_runtime_error.round(1)
+    runtime_vs_rating["avgRatingError"] = mean_error(runtime_vs_rating["ratingStd"], rows, fraction).round(2)
+    runtime_vs_rating["avgRating"] = runtime_vs_rating["avgRating"].round(2)
+    median_rating, median_rating_error = median_with_error(runtime_vs_rating["ratingQuantiles"], rows, fraction)
+    runtime_vs_rating["medianRating"] = median_rating.round(2)
+    runtime_vs_rating["medianRatingError"] = median_rating_error.round(2)
+    runtime_vs_rating = runtime_vs_rating.sort_values("avgRating", ascending=False)
+    runtime_vs_rating = runtime_vs_rating[
+        [
+            "genre",
+            "titleCount",
+            "titleCountError",
+            "avgRuntimeMinutes",
+            "avgRuntimeMinutesError",
+            "medianRuntimeMinutes",
+            "medianRuntimeMinutesError",
+            "avgRating",
+            "avgRatingError",
+            "medianRating",
+            "medianRatingError",
+        ]
+    ]
+    write_dataset(runtime_vs_rating, output_dir, "runtime_vs_rating_by_genre", snapshot_date, generated_at, note=note)
+
+
+def write_gold_manifest(output_dir: Path, snapshot_date: str, generated_at: str) -> None:
+    manifest = {
+        "snapshotDate": snapshot_date,
+        "generatedAt": generated_at,
+        "datasets": sorted(path.stem for path in output_dir.glob("*.json")),
+    }
+    write_json(output_dir / "manifest.json", manifest)
+
+
+def run(
+    snapshot_date: date | None,
+    approximate: bool = False,
+    sample_rows: int | None = None,
+    output_dir: Path | None = None,
+    threads: int | None = None,
+    memory_limit: str | None = None,
+) -> None:
     pipeline_dir = Path(__file__).resolve().parents[1]
     silver_dir = pipeline_dir / "data" / "silver"
-    output_dir = pipeline_dir.parents[0] / "dashboard" / "public" / "data"
-    ensure_dir(output_dir)
 
     resolved_date, silver_path = resolve_snapshot(silver_dir, snapshot_date)
 
-    con = duckdb.connect()
+    con = duckdb.connect(config=duckdb_config(threads, memory_limit))
     load_tables(con, silver_path)
 
     generated_at = now_utc_iso()
-    run_queries(con, output_dir, resolved_date.isoformat(), generated_at)
 
-    prev = previous_snapshot(silver_dir, resolved_date)
-    prev_path = prev[1] if prev else None
-    compute_rising_titles(con, output_dir, resolved_date, prev_path, generated_at)
+    if approximate:
+        # Exploratory output never overwrites the dashboard's exact gold.
+        approx_dir = snapshot_dir(pipeline_dir / "data" / "approx", resolved_date)
+        with staged_output(approx_dir) as staging_dir:
+            run_approx_queries(con, staging_dir, resolved_date.isoformat(), generated_at, sample_rows)
+            write_gold_manifest(staging_dir, resolved_date.isoformat(), generated_at)
+        logging.info("Approximate metrics ready at %s", approx_dir)
+        return
+
+    # The dashboard directory holds other files, so gold is merged into it file by file; an explicit
+    # output_dir (backfill) is a per-snapshot directory that is swapped in whole.
+    merge = output_dir is None
+    if output_dir is None:
+        output_dir = pipeline_dir.parents[0] / "dashboard" / "public" / "data"
+
+    with staged_output(output_dir, merge=merge) as staging_dir:
+        run_queries(con, staging_dir, resolved_date.isoformat(), generated_at)
+
+        prev = previous_snapshot(silver_dir, resolved_date)
+        prev_path = prev[1] if prev else None
+        compute_rising_titles(con, staging_dir, resolved_date, prev_path, generated_at)
+        write_gold_manifest(staging_dir, resolved_date.isoformat(), generated_at)
 
     logging.info("Gold metrics ready at %s", output_dir)
 
@@ -320,13 +552,29 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Snapshot date in YYYY-MM-DD (default: latest silver)",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Compute genre aggregates with sketches and error bounds into data/approx (exploratory)",
+    )
+    parser.add_argument(
+        "--sample-rows",
+        type=int,
+        default=None,
+        help="Reservoir-sample this many titles in --approximate mode (default: all titles)",
+    )
+    args = parser.parse_args()
+    if args.sample_rows is not None and not args.approximate:
+        parser.error("--sample-rows requires --approximate")
+    if args.sample_rows is not None and args.sample_rows <= 0:
+        parser.error("--sample-rows must be positive")
+    return args
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     args = parse_args()
-    run(args.snapshot_date)
+    run(args.snapshot_date, args.approximate, args.sample_rows)
 
 
 if __name__ == "__main__":
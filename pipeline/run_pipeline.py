@@ -1,12 +1,22 @@
 import argparse
 import logging
 from datetime import date
+from pathlib import Path
 
+from pipeline.backfill import run as run_backfill
 from pipeline.ingest.imdb_ingest import run as run_ingest
+from pipeline.lib.io import read_json
+from pipeline.lib.paths import BRONZE_DIR, DASHBOARD_DATA_DIR, SILVER_DIR
+from pipeline.lib.snapshots import snapshot_dir
 from pipeline.metrics.imdb_metrics import run as run_metrics
 from pipeline.transform.imdb_transform import run as run_transform
 
 
+def stage_complete(output_dir: Path, snapshot_date: date) -> bool:
+    manifest = read_json(output_dir / "manifest.json")
+    return bool(manifest) and manifest.get("snapshotDate") == snapshot_date.isoformat()
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run IMDb pipeline end-to-end")
     parser.add_argument(
@@ -21,16 +31,91 @@ def parse_args() -> argparse.Namespace:
         default=8,
         help="Number of snapshots to retain (default: 8)",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse downloads into Parquet while streaming",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun every stage even if its output for the snapshot is already complete",
+    )
+
+    backfill = parser.add_argument_group("backfill", "Recompute silver and gold for existing bronze snapshots")
+    backfill.add_argument(
+        "--from",
+        dest="start",
+        metavar="DATE",
+        type=lambda value: date.fromisoformat(value),
+        default=None,
+        help="First snapshot date to backfill (YYYY-MM-DD)",
+    )
+    backfill.add_argument(
+        "--to",
+        dest="end",
+        metavar="DATE",
+        type=lambda value: date.fromisoformat(value),
+        default=None,
+        help="Last snapshot date to backfill (YYYY-MM-DD)",
+    )
+    backfill.add_argument(
+        "--all-snapshots",
+        action="store_true",
+        help="Backfill every retained snapshot",
+    )
+    backfill.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for backfill (default: CPU count)",
+    )
+    backfill.add_argument(
+        "--metrics-only",
+        action="store_true",
+        help="Backfill gold from existing silver snapshots without rerunning transform",
+    )
+    args = parser.parse_args()
+    args.backfill = args.all_snapshots or args.start is not None or args.end is not None
+    if args.all_snapshots and (args.start or args.end):
+        parser.error("--all-snapshots cannot be combined with --from/--to")
+    if (args.workers is not None or args.metrics_only) and not args.backfill:
+        parser.error("--workers and --metrics-only require --from/--to or --all-snapshots")
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers must be positive")
+    return args
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     args = parse_args()
 
-    run_ingest(args.snapshot_date, args.keep)
-    run_transform(args.snapshot_date, args.keep)
-    run_metrics(args.snapshot_date)
+    if args.backfill:
+        run_backfill(args.start, args.end, args.workers, args.metrics_only)
+        return
+
+    stages = [
+        (
+            "ingest",
+            snapshot_dir(BRONZE_DIR, args.snapshot_date),
+            lambda: run_ingest(args.snapshot_date, args.keep, args.stream),
+        ),
+        (
+            "transform",
+            snapshot_dir(SILVER_DIR, args.snapshot_date),
+            lambda: run_transform(args.snapshot_date, args.keep),
+        ),
+        ("metrics", DASHBOARD_DATA_DIR, lambda: run_metrics(args.snapshot_date)),
+    ]
+
+    # Resume after the last completed stage; once one stage reruns, everything downstream does too.
+    rerun = args.force
+    for name, output_dir, stage in stages:
+        if not rerun and stage_complete(output_dir, args.snapshot_date):
+            logging.info("Skipping %s: %s is already complete", name, output_dir)
+            continue
+        rerun = True
+        stage()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,16 @@
+from __future__ import annotations
+
 import argparse
 import logging
 from datetime import date
 from pathlib import Path
 
-import duckdb
+from pipeline.lib.io import ensure_dir, now_utc_iso, staged_output, write_json
+from pipeline.lib.lazy import lazy_import
+from pipeline.lib.resources import duckdb_config
+from pipeline.lib.snapshots import is_complete, latest_snapshot, parquet_name, snapshot_dir, prune_snapshots
 
-from pipeline.lib.io import ensure_dir, now_utc_iso, write_json
-from pipeline.lib.snapshots import latest_snapshot, snapshot_dir, prune_snapshots
+duckdb = lazy_import("duckdb")
 
 ALLOWED_TYPES = ("movie", "tvSeries", "tvMiniSeries", "tvEpisode")
 
@@ -14,8 +18,8 @@ ALLOWED_TYPES = ("movie", "tvSeries", "tvMiniSeries", "tvEpisode")
 def resolve_snapshot(bronze_dir: Path, snapshot_date: date | None) -> tuple[date, Path]:
     if snapshot_date:
         path = snapshot_dir(bronze_dir, snapshot_date)
-        if not path.exists():
-            raise FileNotFoundError(f"Bronze snapshot not found: {path}")
+        if not is_complete(path):
+            raise FileNotFoundError(f"Complete bronze snapshot not found: {path}")
         return snapshot_date, path
 
     latest = latest_snapshot(bronze_dir)
@@ -24,6 +28,14 @@ def resolve_snapshot(bronze_dir: Path, snapshot_date: date | None) -> tuple[date
     return latest
 
 
+def raw_source(path: Path) -> tuple[str, str]:
+    parsed_path = path.with_name(parquet_name(path.name))
+    if parsed_path.exists():
+        # Written by streaming ingest; already decompressed and parsed to all-varchar columns.
+        return "read_parquet(?)", str(parsed_path)
+    return "read_csv(?, delim='\t', header=true, nullstr='\\N', all_varchar=true)", str(path)
+
+
 def validate_non_empty(con: duckdb.DuckDBPyConnection, table: str) -> None:
     count = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
     if count == 0:
@@ -39,7 +51,12 @@ def validate_unique(con: duckdb.DuckDBPyConnection, table: str, key: str = "tcon
         raise ValueError(f"Validation failed: {table} has {dupes} duplicate {key}")
 
 
-def run(snapshot_date: date | None, keep: int) -> None:
+def run(
+    snapshot_date: date | None,
+    keep: int | None,
+    threads: int | None = None,
+    memory_limit: str | None = None,
+) -> None:
     pipeline_dir = Path(__file__).resolve().parents[1]
     bronze_dir = pipeline_dir / "data" / "bronze"
     silver_dir = pipeline_dir / "data" / "silver"
@@ -47,7 +64,6 @@ def run(snapshot_date: date | None, keep: int) -> None:
 
     resolved_date, bronze_path = resolve_snapshot(bronze_dir, snapshot_date)
     silver_path = snapshot_dir(silver_dir, resolved_date)
-    ensure_dir(silver_path)
 
     basics_path = bronze_path / "title.basics.tsv.gz"
     ratings_path = bronze_path / "title.ratings.tsv.gz"
@@ -57,23 +73,15 @@ def run(snapshot_date: date | None, keep: int) -> None:
         if not path.exists():
             raise FileNotFoundError(f"Missing bronze file: {path}")
 
-    con = duckdb.connect()
+    con = duckdb.connect(config=duckdb_config(threads, memory_limit))
 
-    con.execute(
-        "CREATE OR REPLACE TABLE raw_basics AS "
-        "SELECT * FROM read_csv(?, delim='\t', header=true, nullstr='\\N', all_varchar=true)",
-        [str(basics_path)],
-    )
-    con.execute(
-        "CREATE OR REPLACE TABLE raw_ratings AS "
-        "SELECT * FROM read_csv(?, delim='\t', header=true, nullstr='\\N', all_varchar=true)",
-        [str(ratings_path)],
-    )
-    con.execute(
-        "CREATE OR REPLACE TABLE raw_episodes AS "
-        "SELECT * FROM read_csv(?, delim='\t', header=true, nullstr='\\N', all_varchar=true)",
-        [str(episodes_path)],
-    )
+    for table, path in (
+        ("raw_basics", basics_path),
+        ("raw_ratings", ratings_path),
+        ("raw_episodes", episodes_path),
+    ):
+        reader, source = raw_source(path)
+        con.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM {reader}", [source])
 
     con.execute(
         "CREATE OR REPLACE TABLE title_basics AS "
@@ -136,38 +144,40 @@ def run(snapshot_date: date | None, keep: int) -> None:
     if votes_negative:
         raise ValueError("Validation failed: negative numVotes found")
 
-    con.execute(
-        "COPY title_basics TO ? (FORMAT 'PARQUET')",
-        [str(silver_path / "title_basics.parquet")],
-    )
-    con.execute(
-        "COPY title_ratings TO ? (FORMAT 'PARQUET')",
-        [str(silver_path / "title_ratings.parquet")],
-    )
-    con.execute(
-        "COPY title_episodes TO ? (FORMAT 'PARQUET')",
-        [str(silver_path / "title_episodes.parquet")],
-    )
-
-    manifest = {
-        "snapshotDate": resolved_date.isoformat(),
-        "generatedAt": now_utc_iso(),
-        "inputs": {
-            "basics": str(basics_path.name),
-            "ratings": str(ratings_path.name),
-            "episodes": str(episodes_path.name),
-        },
-        "outputs": {
-            "title_basics": "title_basics.parquet",
-            "title_ratings": "title_ratings.parquet",
-            "title_episodes": "title_episodes.parquet",
-        },
-    }
-    write_json(silver_path / "manifest.json", manifest)
-
-    removed = prune_snapshots(silver_dir, keep=keep)
-    if removed:
-        logging.info("Pruned %s old snapshot(s)", len(removed))
+    with staged_output(silver_path) as staging_path:
+        con.execute(
+            "COPY title_basics TO ? (FORMAT 'PARQUET')",
+            [str(staging_path / "title_basics.parquet")],
+        )
+        con.execute(
+            "COPY title_ratings TO ? (FORMAT 'PARQUET')",
+            [str(staging_path / "title_ratings.parquet")],
+        )
+        con.execute(
+            "COPY title_episodes TO ? (FORMAT 'PARQUET')",
+            [str(staging_path / "title_episodes.parquet")],
+        )
+
+        manifest = {
+            "snapshotDate": resolved_date.isoformat(),
+            "generatedAt": now_utc_iso(),
+            "inputs": {
+                "basics": str(basics_path.name),
+                "ratings": str(ratings_path.name),
+                "episodes": str(episodes_path.name),
+            },
+            "outputs": {
+                "title_basics": "title_basics.parquet",
+                "title_ratings": "title_ratings.parquet",
+                "title_episodes": "title_episodes.parquet",
+            },
+        }
+        write_json(staging_path / "manifest.json", manifest)
+
+    if keep is not None:
+        removed = prune_snapshots(silver_dir, keep=keep)
+        if removed:
+            logging.info("Pruned %s old snapshot(s)", len(removed))
 
     logging.info("Silver snapshot ready at %s", silver_path)
 